@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Coalescer Module for Voice-to-Text App
+Runs UI updates on a background thread, dropping stale ones under bursty use.
+"""
+
+import threading
+import logging
+
+class Coalescer:
+    """Runs a function off the caller's thread, keeping only the latest pending call."""
+
+    def __init__(self, func):
+        self._func = func
+        self._pending = None
+        self._pending_lock = threading.Lock()  # guards _pending
+        self._busy = threading.Lock()          # held while a drain thread runs
+
+    def submit(self, *args):
+        """Queue a call, replacing any call that hasn't started yet."""
+        with self._pending_lock:
+            self._pending = args
+
+        if self._busy.acquire(blocking=False):
+            threading.Thread(target=self._drain, daemon=True).start()
+
+    def _drain(self):
+        """Run pending calls until none are left, then release the busy lock."""
+        while True:
+            try:
+                while True:
+                    with self._pending_lock:
+                        args, self._pending = self._pending, None
+                    if args is None:
+                        break
+
+                    try:
+                        self._func(*args)
+                    except Exception as e:
+                        logging.warning(f"⚠️ Coalesced update error: {e}")
+            finally:
+                self._busy.release()
+
+            # A call may have been submitted after the last check but before
+            # the release; pick it up unless another drain thread already has
+            with self._pending_lock:
+                has_pending = self._pending is not None
+            if not has_pending or not self._busy.acquire(blocking=False):
+                return
@@ -6,17 +6,35 @@ Handles automatic logging of transcription sessions to text files.
 
 import os
 import logging
+import threading
+import time
 from datetime import datetime
 
+_SEP_EQ = "=" * 50
+_SEP_DASH = "-" * 30
+
+def _hms(dt=None):
+    """Format a datetime (or the current local time) as HH:MM:SS without strftime."""
+    if dt is None:
+        t = time.localtime()
+        return f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+    return f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+
 class SessionLogger:
     """Manages session-based logging of voice transcriptions."""
     
-    def __init__(self, log_folder_path="transcription_logs", include_metadata=True):
+    def __init__(self, log_folder_path="transcription_logs", include_metadata=True, max_file_bytes=1_048_576):
         self.log_folder_path = log_folder_path
         self.include_metadata = include_metadata
+        self.max_file_bytes = max_file_bytes
         self.session_file_path = None
         self.session_start_time = None
         self.recording_count = 0
+        self._fh = None
+        self._lock = threading.Lock()
+        self._file_index = 1
+        self._bytes_written = 0
+        self._flush_timer = None
         
         # Create session file
         self._create_session_file()
@@ -25,25 +43,11 @@ class SessionLogger:
         """Create a new session log file with timestamp."""
         try:
             # Create log folder if it doesn't exist
-            if not os.path.exists(self.log_folder_path):
-                os.makedirs(self.log_folder_path)
-                logging.info(f"📁 Created log folder: {self.log_folder_path}")
+            os.makedirs(self.log_folder_path, exist_ok=True)
             
             # Generate session filename with timestamp
             self.session_start_time = datetime.now()
-            timestamp = self.session_start_time.strftime("%Y-%m-%d_%H-%M-%S")
-            filename = f"VoiceToText_Session_{timestamp}.txt"
-            self.session_file_path = os.path.join(self.log_folder_path, filename)
-            
-            # Create session file with header
-            with open(self.session_file_path, 'w', encoding='utf-8') as f:
-                f.write("=" * 50 + "\n")
-                f.write("🎤 VOICE-TO-TEXT SESSION LOG\n")
-                f.write("=" * 50 + "\n")
-                f.write(f"Session started: {self.session_start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"App: Voice-to-Text Transcription App\n")
-                f.write(f"Log file: {filename}\n")
-                f.write("=" * 50 + "\n\n")
+            self._open_session_file()
             
             logging.info(f"📝 Session log created: {self.session_file_path}")
             return True
@@ -51,36 +55,89 @@ class SessionLogger:
         except Exception as e:
             logging.error(f"❌ Failed to create session log: {e}")
             self.session_file_path = None
+            self._fh = None
             return False
     
+    def _open_session_file(self):
+        """Open the current part of the session log and write its header."""
+        timestamp = self.session_start_time.strftime("%Y-%m-%d_%H-%M-%S")
+        suffix = f"_{self._file_index:03d}" if self._file_index > 1 else ""
+        filename = f"VoiceToText_Session_{timestamp}{suffix}.txt"
+        self.session_file_path = os.path.join(self.log_folder_path, filename)
+        
+        # Keep one buffered handle open for the whole session instead of
+        # reopening the file for every entry. Entries are never flushed or
+        # fsynced individually; a timer flushes the buffer shortly after each
+        # burst of writes, so an abrupt exit loses at most the last ~0.5 s.
+        self._fh = open(self.session_file_path, 'w', encoding='utf-8', buffering=1 << 16)
+        self._bytes_written = 0
+        
+        # Write session header
+        self._write_entry(
+            f"{_SEP_EQ}\n"
+            "🎤 VOICE-TO-TEXT SESSION LOG\n"
+            f"{_SEP_EQ}\n"
+            f"Session started: {self.session_start_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"App: Voice-to-Text Transcription App\n"
+            f"Log file: {filename}\n"
+            f"{_SEP_EQ}\n\n"
+        )
+    
+    def _write_entry(self, entry, allow_rollover=True):
+        """Write one fully formatted entry to the session file (caller holds the lock)."""
+        entry_bytes = len(entry.encode("utf-8"))
+        
+        # Continue in a new part file once the current one reaches the size
+        # limit, so appends stay cheap in very long sessions
+        if (allow_rollover and self._bytes_written
+                and self._bytes_written + entry_bytes > self.max_file_bytes):
+            self._fh.close()
+            self._file_index += 1
+            self._open_session_file()
+            logging.info(f"📝 Session log continued in: {self.session_file_path}")
+        
+        self._fh.write(entry)
+        self._bytes_written += entry_bytes
+        
+        # Flush (without fsync) shortly after this write, coalescing bursts
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(0.5, self._flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def _flush(self):
+        """Push buffered entries to the OS (runs on the flush timer thread)."""
+        with self._lock:
+            self._flush_timer = None
+            if self._fh:
+                try:
+                    self._fh.flush()
+                except Exception as e:
+                    logging.warning(f"⚠️ Failed to flush session log: {e}")
+    
     def log_transcription(self, text, recording_duration=None, recording_start_time=None):
         """Log a transcription to the session file."""
-        if not self.session_file_path:
+        if not self._fh:
             logging.warning("⚠️ No session file available for logging")
             return False
         
         try:
-            self.recording_count += 1
-            
             # Use current time if recording start time not provided
-            if recording_start_time is None:
-                recording_start_time = datetime.now()
-            
-            with open(self.session_file_path, 'a', encoding='utf-8') as f:
-                # Write timestamp and recording info
-                timestamp_str = recording_start_time.strftime("%H:%M:%S")
-                f.write(f"[{timestamp_str}] Recording #{self.recording_count}")
-                
-                if self.include_metadata and recording_duration:
-                    f.write(f" (Duration: {recording_duration:.1f}s)")
-                
-                f.write("\n")
-                
-                # Write the transcribed text with proper formatting
-                f.write(f'"{text}"\n\n')
-                
-                # Add separator for readability
-                f.write("-" * 30 + "\n\n")
+            timestamp_str = _hms(recording_start_time)
+            
+            duration_str = ""
+            if self.include_metadata and recording_duration:
+                duration_str = f" (Duration: {recording_duration:.1f}s)"
+            
+            with self._lock:
+                self.recording_count += 1
+                # Timestamp and recording info, the transcribed text, and a
+                # separator for readability, written in one call
+                self._write_entry(
+                    f"[{timestamp_str}] Recording #{self.recording_count}{duration_str}\n"
+                    f'"{text}"\n\n'
+                    f"{_SEP_DASH}\n\n"
+                )
             
             logging.info(f"📝 Transcription #{self.recording_count} logged to session file")
             return True
@@ -91,20 +148,19 @@ class SessionLogger:
     
     def log_error(self, error_message, recording_start_time=None):
         """Log an error or failed transcription to the session file."""
-        if not self.session_file_path:
+        if not self._fh:
             return False
         
         try:
-            self.recording_count += 1
-            
-            if recording_start_time is None:
-                recording_start_time = datetime.now()
+            timestamp_str = _hms(recording_start_time)
             
-            with open(self.session_file_path, 'a', encoding='utf-8') as f:
-                timestamp_str = recording_start_time.strftime("%H:%M:%S")
-                f.write(f"[{timestamp_str}] Recording #{self.recording_count} - ERROR\n")
-                f.write(f"❌ {error_message}\n\n")
-                f.write("-" * 30 + "\n\n")
+            with self._lock:
+                self.recording_count += 1
+                self._write_entry(
+                    f"[{timestamp_str}] Recording #{self.recording_count} - ERROR\n"
+                    f"❌ {error_message}\n\n"
+                    f"{_SEP_DASH}\n\n"
+                )
             
             logging.info(f"📝 Error logged to session file")
             return True
@@ -115,14 +171,17 @@ class SessionLogger:
     
     def add_session_note(self, note):
         """Add a custom note to the session file."""
-        if not self.session_file_path:
+        if not self._fh:
             return False
         
         try:
-            with open(self.session_file_path, 'a', encoding='utf-8') as f:
-                timestamp_str = datetime.now().strftime("%H:%M:%S")
-                f.write(f"[{timestamp_str}] NOTE: {note}\n\n")
-                f.write("-" * 30 + "\n\n")
+            timestamp_str = _hms()
+            
+            with self._lock:
+                self._write_entry(
+                    f"[{timestamp_str}] NOTE: {note}\n\n"
+                    f"{_SEP_DASH}\n\n"
+                )
             
             logging.info(f"📝 Note added to session file")
             return True
@@ -133,21 +192,35 @@ class SessionLogger:
     
     def close_session(self):
         """Close the session and add footer to the log file."""
-        if not self.session_file_path:
+        if not self._fh:
             return False
         
         try:
             session_end_time = datetime.now()
             session_duration = session_end_time - self.session_start_time
             
-            with open(self.session_file_path, 'a', encoding='utf-8') as f:
-                f.write("\n" + "=" * 50 + "\n")
-                f.write("📊 SESSION SUMMARY\n")
-                f.write("=" * 50 + "\n")
-                f.write(f"Session ended: {session_end_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Total duration: {session_duration}\n")
-                f.write(f"Total recordings: {self.recording_count}\n")
-                f.write("=" * 50 + "\n")
+            with self._lock:
+                self._write_entry(
+                    f"\n{_SEP_EQ}\n"
+                    "📊 SESSION SUMMARY\n"
+                    f"{_SEP_EQ}\n"
+                    f"Session ended: {session_end_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+                    f"Total duration: {session_duration}\n"
+                    f"Total recordings: {self.recording_count}\n"
+                    f"{_SEP_EQ}\n",
+                    # Keep the summary in the last part instead of a part of its own
+                    allow_rollover=False
+                )
+                
+                # Flush buffered entries to disk and release the handle
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                f = self._fh
+                f.flush()
+                os.fsync(f.fileno())
+                f.close()
+                self._fh = None
             
             logging.info(f"📝 Session closed: {self.recording_count} recordings logged")
             return True
@@ -12,13 +12,22 @@ Features:
 """
 
 import os
+import functools
+import queue
 import threading
 import logging
 import time
+import wave
+from datetime import datetime
 import numpy as np
 import sounddevice as sd
 import scipy.io.wavfile as wav
-import whisper
+try:
+    import soundfile as sf
+except ImportError:
+    sf = None
+import ctranslate2
+from faster_whisper import WhisperModel
 import keyboard
 import pyperclip
 import pyautogui
@@ -42,6 +51,9 @@ ENABLE_SESSION_LOGGING = True     # Enable automatic session logging to text fil
 LOG_FOLDER_PATH = "transcription_logs"  # Folder to save session logs (relative to app directory)
 LOG_INCLUDE_METADATA = True       # Include recording duration and timestamps in logs
 
+# Debug audio persistence (transcription never needs the WAV file)
+SAVE_WAV_DEBUG = False            # Save each recording to TEMP_WAV_PATH for debugging
+
 # Use absolute path for temp file to avoid working directory issues
 TEMP_WAV_PATH     = os.path.join(os.getcwd(), 'temp_audio.wav')
 
@@ -54,49 +66,108 @@ logging.basicConfig(
 
 # ─── Global State ──────────────────────────────────────────────────────────────
 model = None
+device = None                     # 'cuda' or 'cpu', set when the model is loaded
 recording = False
-audio_frames = []
+audio_buf = None                  # preallocated sample buffer for the current recording
+audio_pos = 0                     # number of samples written into audio_buf
+buffer_full = False               # set once audio_buf fills and auto-stop is scheduled
 stream = None
 auto_stop_timer = None
 visual_indicator = None
 session_logger = None
 recording_start_time = None
+_rec_lock = threading.Lock()      # guards recording/audio_buf/audio_pos between streams
+_wav_q = queue.Queue()            # (audio, path) jobs for the WAV writer thread
+
+def _warm_up_model(whisper_model):
+    """Run one second of silence through the model, raising on failure."""
+    # VAD is left off here, otherwise the silence would be filtered out and
+    # nothing would run
+    segments, _ = whisper_model.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), beam_size=1)
+    list(segments)
 
 def load_whisper_model():
     """Load the Whisper model with progress indication."""
-    global model
+    global model, device
     try:
-        logging.info(f"🔄 Loading Whisper '{MODEL_NAME}' model... (this may take a moment)")
-        model = whisper.load_model(MODEL_NAME)
-        logging.info("✅ Whisper model loaded successfully!")
+        # int8 weights via CTranslate2; fp16 activations on the GPU
+        device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        compute_type = "int8_float16" if device == "cuda" else "int8"
+        logging.info(f"🔄 Loading Whisper '{MODEL_NAME}' model on {device} ({compute_type})... (this may take a moment)")
+
+        # Warm up right after loading so the first recording doesn't pay the
+        # one-off initialisation cost. A visible GPU doesn't guarantee the
+        # CUDA libraries (cuBLAS/cuDNN) are installed, and a missing library
+        # may only surface on the first transcribe, so a failed CUDA load or
+        # warm-up falls back to the CPU instead of failing startup.
+        if device == "cuda":
+            try:
+                model = WhisperModel(MODEL_NAME, device=device, compute_type=compute_type)
+                _warm_up_model(model)
+            except Exception as e:
+                logging.warning(f"⚠️ CUDA model load/warm-up failed ({e}), falling back to CPU")
+                model = None
+                device = "cpu"
+
+        if device == "cpu":
+            model = WhisperModel(MODEL_NAME, device=device, compute_type="int8")
+            try:
+                _warm_up_model(model)
+            except Exception as e:
+                logging.warning(f"⚠️ Whisper warm-up failed: {e}")
+
+        logging.info(f"✅ Whisper model loaded successfully on {device}!")
         return True
     except Exception as e:
         logging.error(f"❌ Failed to load Whisper model: {e}")
         return False
 
 # ─── Audio Callback ────────────────────────────────────────────────────────────
-def audio_callback(indata, frames, time, status):
+def audio_callback(indata, frames, time, status, buf=None):
     """Callback function for audio stream to capture audio data."""
     # Note: frames and time parameters are required by sounddevice but not used
     _ = frames, time  # Suppress unused variable warnings
 
+    global audio_pos, buffer_full
+
     if status:
         logging.warning(f"Audio status: {status}")
-    if recording:
-        audio_frames.append(indata.copy())
+    with _rec_lock:
+        # Each stream is bound to its own recording's buffer; drop late blocks
+        # from a stream that is still stopping after the next one started
+        if not recording or buf is not audio_buf:
+            return
+
+        # Copy the block into the preallocated buffer, never past its end
+        n = min(len(indata), buf.size - audio_pos)
+        buf[audio_pos:audio_pos + n] = indata[:n, 0]
+        audio_pos += n
+
+        # Buffer is full: stop now rather than waiting for the timer. The
+        # stop runs on its own thread since it closes this stream.
+        if n < len(indata) and not buffer_full:
+            buffer_full = True
+            logging.warning("⚠️ Recording buffer full, stopping...")
+            threading.Thread(target=stop_recording_and_transcribe, daemon=True).start()
 
 # ─── Start Recording ───────────────────────────────────────────────────────────
 def start_recording():
     """Start audio recording from microphone."""
-    global recording, audio_frames, stream, auto_stop_timer, recording_start_time
+    global recording, audio_buf, audio_pos, buffer_full, stream, auto_stop_timer, recording_start_time
 
     if recording:
         logging.debug("start_recording called while already recording.")
         return
 
-    # Reset audio buffer and record start time
-    audio_frames = []
-    recording = True
+    # Allocate a fresh buffer for the full max duration and record start time.
+    # A new buffer per recording keeps a previous one intact while it is
+    # still being transcribed.
+    buf = np.empty(MAX_DURATION_SEC * SAMPLE_RATE, dtype=np.int16)
+    with _rec_lock:
+        audio_buf = buf
+        audio_pos = 0
+        buffer_full = False
+        recording = True
     recording_start_time = time.time()
     
     try:
@@ -104,8 +175,9 @@ def start_recording():
         stream = sd.InputStream(
             samplerate=SAMPLE_RATE,
             channels=1,
-            callback=audio_callback,
-            dtype=np.float32
+            callback=functools.partial(audio_callback, buf=buf),
+            dtype=np.int16,
+            blocksize=SAMPLE_RATE // 10  # 100 ms blocks keep callback overhead low
         )
         stream.start()
         logging.info("🎙️ Recording started... (max 30 min)")
@@ -123,6 +195,154 @@ def start_recording():
         logging.error(f"❌ Failed to start recording: {e}")
         logging.error("Make sure your microphone is connected and accessible.")
 
+# ─── Persist WAV ───────────────────────────────────────────────────────────────
+def _persist_wav(audio_int16, path):
+    """Write recorded int16 audio to a WAV file (runs off the transcription path)."""
+    logging.info(f"💾 Saving audio to: {path}")
+
+    # Method 1: Try using soundfile (more reliable than scipy on Windows)
+    if sf is None:
+        logging.info("📝 soundfile not available, falling back to scipy")
+    else:
+        try:
+            sf.write(path, audio_int16, SAMPLE_RATE, format='WAV', subtype='PCM_16')
+            logging.info("✅ WAV file saved using soundfile library")
+            return True
+        except Exception as sf_error:
+            logging.warning(f"⚠️ soundfile failed: {sf_error}, falling back to scipy")
+
+    # Method 2: Fallback to scipy with explicit file handling
+    try:
+        wav.write(path, SAMPLE_RATE, audio_int16)
+        logging.info("✅ WAV file saved using scipy")
+        return True
+    except Exception as scipy_error:
+        logging.error(f"❌ scipy WAV write failed: {scipy_error}")
+
+    # Method 3: Last resort - use wave module for maximum compatibility
+    try:
+        with wave.open(path, 'wb') as wav_file:
+            wav_file.setnchannels(1)  # mono
+            wav_file.setsampwidth(2)  # 16-bit
+            wav_file.setframerate(SAMPLE_RATE)
+            wav_file.writeframes(audio_int16.tobytes())
+        logging.info("✅ WAV file saved using wave module")
+        return True
+    except Exception as wave_error:
+        logging.error(f"❌ wave module failed: {wave_error}")
+
+    logging.error("❌ All WAV writing methods failed!")
+    return False
+
+def _wav_writer_loop():
+    """Persistent writer thread: save queued recordings one at a time."""
+    while True:
+        audio_int16, path = _wav_q.get()
+        try:
+            _persist_wav(audio_int16, path)
+        except Exception as e:
+            logging.error(f"❌ WAV writer error: {e}")
+
+# ─── Paste ─────────────────────────────────────────────────────────────────────
+if os.name == 'nt':
+    import ctypes
+    from ctypes import wintypes
+
+    _CF_UNICODETEXT = 13
+    _GMEM_MOVEABLE = 0x0002
+    _INPUT_KEYBOARD = 1
+    _KEYEVENTF_KEYUP = 0x0002
+    _VK_CONTROL = 0x11
+    _VK_V = 0x56
+
+    class _MOUSEINPUT(ctypes.Structure):
+        _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG),
+                    ("mouseData", wintypes.DWORD), ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+    class _KEYBDINPUT(ctypes.Structure):
+        _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD),
+                    ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD),
+                    ("dwExtraInfo", ctypes.c_size_t)]
+
+    class _INPUTUNION(ctypes.Union):
+        # MOUSEINPUT is the largest member, so it sets the union size
+        _fields_ = [("mi", _MOUSEINPUT), ("ki", _KEYBDINPUT)]
+
+    class _INPUT(ctypes.Structure):
+        _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+    # Private DLL handles so our argtypes don't clash with pyperclip/pyautogui
+    _user32 = ctypes.WinDLL('user32', use_last_error=True)
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    _user32.OpenClipboard.argtypes = [wintypes.HWND]
+    _user32.OpenClipboard.restype = wintypes.BOOL
+    _user32.EmptyClipboard.restype = wintypes.BOOL
+    _user32.CloseClipboard.restype = wintypes.BOOL
+    _user32.SetClipboardData.argtypes = [wintypes.UINT, wintypes.HANDLE]
+    _user32.SetClipboardData.restype = wintypes.HANDLE
+    _user32.SendInput.argtypes = [wintypes.UINT, ctypes.POINTER(_INPUT), ctypes.c_int]
+    _user32.SendInput.restype = wintypes.UINT
+    _kernel32.GlobalAlloc.argtypes = [wintypes.UINT, ctypes.c_size_t]
+    _kernel32.GlobalAlloc.restype = wintypes.HGLOBAL
+    _kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
+    _kernel32.GlobalLock.restype = wintypes.LPVOID
+    _kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+    _kernel32.GlobalUnlock.restype = wintypes.BOOL
+    _kernel32.GlobalFree.argtypes = [wintypes.HGLOBAL]
+    _kernel32.GlobalFree.restype = wintypes.HGLOBAL
+
+    def _win_set_clipboard_text(text):
+        """Place text on the Windows clipboard as CF_UNICODETEXT."""
+        data = ctypes.create_unicode_buffer(text)
+        size = ctypes.sizeof(data)
+        if not _user32.OpenClipboard(None):
+            raise ctypes.WinError(ctypes.get_last_error())
+        try:
+            _user32.EmptyClipboard()
+            handle = _kernel32.GlobalAlloc(_GMEM_MOVEABLE, size)
+            if not handle:
+                raise ctypes.WinError(ctypes.get_last_error())
+            ptr = _kernel32.GlobalLock(handle)
+            ctypes.memmove(ptr, data, size)
+            _kernel32.GlobalUnlock(handle)
+            # On success the clipboard owns the memory
+            if not _user32.SetClipboardData(_CF_UNICODETEXT, handle):
+                _kernel32.GlobalFree(handle)
+                raise ctypes.WinError(ctypes.get_last_error())
+        finally:
+            _user32.CloseClipboard()
+
+    def _win_send_ctrl_v():
+        """Synthesize a Ctrl+V keystroke with a single SendInput call."""
+        def key(vk, flags=0):
+            return _INPUT(type=_INPUT_KEYBOARD, u=_INPUTUNION(ki=_KEYBDINPUT(wVk=vk, dwFlags=flags)))
+
+        inputs = (_INPUT * 4)(
+            key(_VK_CONTROL),
+            key(_VK_V),
+            key(_VK_V, _KEYEVENTF_KEYUP),
+            key(_VK_CONTROL, _KEYEVENTF_KEYUP),
+        )
+        if _user32.SendInput(len(inputs), inputs, ctypes.sizeof(_INPUT)) != len(inputs):
+            raise ctypes.WinError(ctypes.get_last_error())
+
+def _fast_paste(text):
+    """Copy text to the clipboard and paste it at the cursor."""
+    # Native path on Windows: the clipboard is set synchronously before the
+    # keystroke is sent, so no settle delay is needed
+    if os.name == 'nt':
+        try:
+            _win_set_clipboard_text(text)
+            _win_send_ctrl_v()
+            return
+        except OSError as e:
+            logging.warning(f"⚠️ Native paste failed: {e}, falling back to pyperclip")
+
+    pyperclip.copy(text)
+    time.sleep(0.1)  # Small delay to ensure clipboard is ready
+    pyautogui.hotkey('ctrl', 'v')
+
 # ─── Stop Recording & Transcribe ───────────────────────────────────────────────
 def stop_recording_and_transcribe():
     """Stop recording and transcribe the audio to text."""
@@ -132,117 +352,67 @@ def stop_recording_and_transcribe():
         logging.debug("stop_recording called with no active recording.")
         return
 
-    recording = False
+    # Take this recording's state now: a toggle while the stream is stopping
+    # starts the next recording inline and replaces the globals
+    with _rec_lock:
+        recording = False
+        buf, pos = audio_buf, audio_pos
+    s, timer, start_time = stream, auto_stop_timer, recording_start_time
+    stream = None
+    auto_stop_timer = None
 
     # Update visual indicators
     if visual_indicator and ENABLE_VISUAL_INDICATORS:
         visual_indicator.stop_recording()
 
     # Cancel auto-stop timer if manually stopped
-    if auto_stop_timer and auto_stop_timer.is_alive():
-        auto_stop_timer.cancel()
+    if timer and timer.is_alive():
+        timer.cancel()
 
     try:
         # Stop and close audio stream
-        if stream:
-            stream.stop()
-            stream.close()
-            stream = None
+        if s:
+            s.stop()
+            s.close()
 
-        if not audio_frames:
+        if not pos:
             logging.warning("⚠️ No audio data recorded.")
             return
 
-        # Concatenate audio buffers and save to WAV
+        # Take a view of the recorded samples (no copy, no concatenate)
         logging.info("💾 Processing audio...")
-        logging.info(f"📊 Captured {len(audio_frames)} audio frames")
-
-        audio_np = np.concatenate(audio_frames, axis=0).flatten()
-        logging.info(f"📊 Audio array shape: {audio_np.shape}, dtype: {audio_np.dtype}")
-
-        # Convert float32 to int16 for WAV file
-        audio_int16 = (audio_np * 32767).astype(np.int16)
-
-        # Save WAV file with improved Windows compatibility
-        logging.info(f"💾 Saving audio to: {TEMP_WAV_PATH}")
-
-        # Method 1: Try using soundfile (more reliable than scipy on Windows)
-        wav_saved = False
-        try:
-            import soundfile as sf
-            sf.write(TEMP_WAV_PATH, audio_np, SAMPLE_RATE, format='WAV', subtype='PCM_16')
-            wav_saved = True
-            logging.info("✅ WAV file saved using soundfile library")
-        except ImportError:
-            logging.info("📝 soundfile not available, falling back to scipy")
-        except Exception as sf_error:
-            logging.warning(f"⚠️ soundfile failed: {sf_error}, falling back to scipy")
+        logging.info(f"📊 Captured {pos} audio samples")
 
-        # Method 2: Fallback to scipy with explicit file handling
-        if not wav_saved:
-            try:
-                wav.write(TEMP_WAV_PATH, SAMPLE_RATE, audio_int16)
-                wav_saved = True
-                logging.info("✅ WAV file saved using scipy")
-            except Exception as scipy_error:
-                logging.error(f"❌ scipy WAV write failed: {scipy_error}")
-
-        # Method 3: Last resort - use wave module for maximum compatibility
-        if not wav_saved:
-            try:
-                import wave
-                with wave.open(TEMP_WAV_PATH, 'wb') as wav_file:
-                    wav_file.setnchannels(1)  # mono
-                    wav_file.setsampwidth(2)  # 16-bit
-                    wav_file.setframerate(SAMPLE_RATE)
-                    wav_file.writeframes(audio_int16.tobytes())
-                wav_saved = True
-                logging.info("✅ WAV file saved using wave module")
-            except Exception as wave_error:
-                logging.error(f"❌ wave module failed: {wave_error}")
-
-        if not wav_saved:
-            logging.error("❌ All WAV writing methods failed!")
-            return
+        audio_int16 = buf[:pos]
+        logging.info(f"📊 Audio array shape: {audio_int16.shape}, dtype: {audio_int16.dtype}")
 
-        # Ensure file is fully written and accessible
-        time.sleep(0.1)  # Small delay to ensure file is flushed
-
-        # Verify file was created and is accessible
-        if not os.path.exists(TEMP_WAV_PATH):
-            logging.error(f"❌ WAV file does not exist: {TEMP_WAV_PATH}")
-            return
+        # Optionally hand the WAV to the writer thread; the buffer is never
+        # reused, so the writer can read the view directly
+        if SAVE_WAV_DEBUG:
+            _wav_q.put((audio_int16, TEMP_WAV_PATH))
 
-        file_size = os.path.getsize(TEMP_WAV_PATH)
-        logging.info(f"✅ WAV file verified ({file_size} bytes)")
-
-        # Additional file verification - try to read it back
-        try:
-            test_rate, test_data = wav.read(TEMP_WAV_PATH)
-            logging.info(f"✅ WAV file readable - rate: {test_rate}, samples: {len(test_data)}")
-        except Exception as read_error:
-            logging.warning(f"⚠️ WAV file read test failed: {read_error}")
+        # Whisper expects float32 in [-1, 1]; convert in a single pass
+        audio_np = np.multiply(audio_int16, 1.0 / 32768.0, dtype=np.float32)
 
         # Transcribe audio using Whisper with enhanced error handling
         logging.info("📝 Transcribing... please wait.")
         try:
             # Use direct numpy array transcription (bypasses ffmpeg requirement)
             logging.info("📝 Using direct numpy array transcription...")
-            result = model.transcribe(audio_np, fp16=False)
-            text = result.get('text', '').strip()
+            segments, _ = model.transcribe(audio_np, beam_size=1, vad_filter=True)
+            text = ''.join(segment.text for segment in segments).strip()
 
             if text:
                 logging.info(f"✅ Transcription: \"{text}\"")
 
                 # Calculate recording duration
                 recording_duration = None
-                if recording_start_time:
-                    recording_duration = time.time() - recording_start_time
+                if start_time:
+                    recording_duration = time.time() - start_time
 
                 # Log to session file
                 if session_logger and ENABLE_SESSION_LOGGING:
-                    from datetime import datetime
-                    start_datetime = datetime.fromtimestamp(recording_start_time) if recording_start_time else None
+                    start_datetime = datetime.fromtimestamp(start_time) if start_time else None
                     session_logger.log_transcription(text, recording_duration, start_datetime)
 
                 # Update visual indicators
@@ -250,17 +420,14 @@ def stop_recording_and_transcribe():
                     visual_indicator.transcription_complete(text)
 
                 # Copy to clipboard and paste
-                pyperclip.copy(text)
-                time.sleep(0.1)  # Small delay to ensure clipboard is ready
-                pyautogui.hotkey('ctrl', 'v')
+                _fast_paste(text)
                 logging.info("📋 Text pasted at cursor.")
             else:
                 logging.warning("⚠️ No speech detected in recording.")
 
                 # Log error to session file
                 if session_logger and ENABLE_SESSION_LOGGING:
-                    from datetime import datetime
-                    start_datetime = datetime.fromtimestamp(recording_start_time) if recording_start_time else None
+                    start_datetime = datetime.fromtimestamp(start_time) if start_time else None
                     session_logger.log_error("No speech detected in recording", start_datetime)
 
                 if visual_indicator and ENABLE_VISUAL_INDICATORS:
@@ -268,16 +435,10 @@ def stop_recording_and_transcribe():
 
         except Exception as transcribe_error:
             logging.error(f"❌ Transcription error: {transcribe_error}")
-            logging.error(f"❌ WAV file path: {TEMP_WAV_PATH}")
-            logging.error(f"❌ Absolute path: {os.path.abspath(TEMP_WAV_PATH)}")
-            logging.error(f"❌ WAV file exists: {os.path.exists(TEMP_WAV_PATH)}")
-            if os.path.exists(TEMP_WAV_PATH):
-                logging.error(f"❌ WAV file size: {os.path.getsize(TEMP_WAV_PATH)} bytes")
 
             # Log error to session file
             if session_logger and ENABLE_SESSION_LOGGING:
-                from datetime import datetime
-                start_datetime = datetime.fromtimestamp(recording_start_time) if recording_start_time else None
+                start_datetime = datetime.fromtimestamp(start_time) if start_time else None
                 session_logger.log_error(f"Transcription failed: {transcribe_error}", start_datetime)
 
             if visual_indicator and ENABLE_VISUAL_INDICATORS:
@@ -287,38 +448,21 @@ def stop_recording_and_transcribe():
         logging.error(f"❌ Error during audio processing: {e}")
         import traceback
         logging.error(f"❌ Full traceback: {traceback.format_exc()}")
-    finally:
-        # Clean up temporary file
-        if os.path.exists(TEMP_WAV_PATH):
-            try:
-                os.remove(TEMP_WAV_PATH)
-                logging.debug(f"🗑️ Cleaned up temp file: {TEMP_WAV_PATH}")
-            except Exception as e:
-                logging.warning(f"Could not remove temp file: {e}")
 
-# ─── Hotkey Listener ───────────────────────────────────────────────────────────
-def hotkey_listener():
-    """Listen for hotkey presses to toggle recording."""
-    logging.info(f"🚀 Press {HOTKEY_TOGGLE} to toggle recording, {EXIT_HOTKEY} to exit.")
-    logging.info("🎯 Ready! Position your cursor where you want text to be pasted.")
-    
-    while True:
-        try:
-            keyboard.wait(HOTKEY_TOGGLE)
-            # Dispatch in a thread to keep UI responsive
-            if not recording:
-                threading.Thread(target=start_recording, daemon=True).start()
-            else:
-                threading.Thread(target=stop_recording_and_transcribe, daemon=True).start()
-        except Exception as e:
-            logging.error(f"❌ Hotkey listener error: {e}")
-            break
+# ─── Hotkey Handlers ───────────────────────────────────────────────────────────
+def _toggle():
+    """Toggle recording on each press of the toggle hotkey."""
+    # Starting returns right after stream.start(), so run it inline; only the
+    # long-running stop + transcription goes to a thread to keep the keyboard
+    # hook responsive
+    if not recording:
+        start_recording()
+    else:
+        threading.Thread(target=stop_recording_and_transcribe, daemon=True).start()
 
-# ─── Exit Listener ─────────────────────────────────────────────────────────────
-def exit_listener():
-    """Listen for exit hotkey and perform graceful shutdown."""
+def _shutdown():
+    """Handle the exit hotkey and perform graceful shutdown."""
     try:
-        keyboard.wait(EXIT_HOTKEY)
         logging.info("👋 Exit signal received. Shutting down...")
         
         # Stop recording if active
@@ -326,10 +470,6 @@ def exit_listener():
             stream.stop()
             stream.close()
         
-        # Clean up temp file
-        if os.path.exists(TEMP_WAV_PATH):
-            os.remove(TEMP_WAV_PATH)
-
         # Close session log
         if session_logger:
             session_logger.close_session()
@@ -340,9 +480,20 @@ def exit_listener():
 
         os._exit(0)
     except Exception as e:
-        logging.error(f"❌ Exit listener error: {e}")
+        logging.error(f"❌ Shutdown error: {e}")
         os._exit(1)
 
+# ─── Hotkey Listener ───────────────────────────────────────────────────────────
+def hotkey_listener():
+    """Register hotkey callbacks and block until the app exits."""
+    logging.info(f"🚀 Press {HOTKEY_TOGGLE} to toggle recording, {EXIT_HOTKEY} to exit.")
+    logging.info("🎯 Ready! Position your cursor where you want text to be pasted.")
+    
+    # Callbacks are fired directly by the keyboard hook thread
+    keyboard.add_hotkey(HOTKEY_TOGGLE, _toggle)
+    keyboard.add_hotkey(EXIT_HOTKEY, _shutdown)
+    keyboard.wait()
+
 # ─── Main Entrypoint ───────────────────────────────────────────────────────────
 def main():
     """Main application entry point."""
@@ -352,7 +503,9 @@ def main():
 
     # Show working directory and temp file path for debugging
     logging.info(f"📁 Working directory: {os.getcwd()}")
-    logging.info(f"📄 Temp file path: {TEMP_WAV_PATH}")
+    if SAVE_WAV_DEBUG:
+        logging.info(f"📄 Temp file path: {TEMP_WAV_PATH}")
+        threading.Thread(target=_wav_writer_loop, daemon=True).start()
 
     # Load Whisper model
     if not load_whisper_model():
@@ -377,17 +530,13 @@ def main():
     global visual_indicator
     if ENABLE_VISUAL_INDICATORS:
         try:
-            visual_indicator = SimpleVisualIndicator(MAX_DURATION_SEC)
+            visual_indicator = SimpleVisualIndicator(MAX_DURATION_SEC, on_exit=_shutdown)
             logging.info("✅ Visual indicators initialized")
         except Exception as e:
             logging.warning(f"⚠️ Failed to initialize visual indicators: {e}")
             logging.info("📝 Continuing without visual indicators...")
     
     try:
-        # Start exit listener thread
-        exit_thread = threading.Thread(target=exit_listener, daemon=True)
-        exit_thread.start()
-        
         # Start hotkey listener (blocking)
         hotkey_listener()
         
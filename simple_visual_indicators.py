@@ -4,34 +4,44 @@ Simplified Visual Indicators Module for Voice-to-Text App
 Provides system tray icon and desktop notifications without complex GUI threading.
 """
 
+import sys
 import threading
 import time
 import logging
-from PIL import Image, ImageDraw
+from tray_icons import TRAY_ICONS
+from coalescer import Coalescer
 
 class SimpleVisualIndicator:
     """Manages visual feedback for the voice-to-text application (simplified version)."""
     
-    def __init__(self, max_duration_sec=300):
+    def __init__(self, max_duration_sec=300, on_exit=None):
         self.max_duration_sec = max_duration_sec
+        self.on_exit = on_exit  # app shutdown hook used by the tray "Exit" item
         self.recording = False
         self.start_time = None
         self.tray_icon = None
+        self._status_text = "Status: Idle"
         self.running = True
-        self.warning_30_shown = False
-        self.warning_10_shown = False
+        self._warning_timers = []
+        
+        # Pre-rendered tray icon variants; state changes just swap them
+        self._icon_gray = TRAY_ICONS["gray"]
+        self._icon_red = TRAY_ICONS["red"]
+        
+        # Notifications and tray updates run off the caller's thread; under
+        # bursty triggers only the latest pending one is applied
+        self._notifications = Coalescer(self._send_notification)
+        self._tray_updates = Coalescer(self._apply_tray_state)
         
         # Try to import optional dependencies
+        self._notify = None
+        self._tray_notify = False
         self.has_pystray = self._try_import_pystray()
         self.has_plyer = self._try_import_plyer()
         
         # Initialize components
         if self.has_pystray:
             self._setup_tray_icon()
-        
-        # Start monitoring thread for time warnings
-        self.monitor_thread = threading.Thread(target=self._monitor_recording_time, daemon=True)
-        self.monitor_thread.start()
     
     def _try_import_pystray(self):
         """Try to import pystray for system tray functionality."""
@@ -46,36 +56,13 @@ class SimpleVisualIndicator:
     def _try_import_plyer(self):
         """Try to import plyer for desktop notifications."""
         try:
-            global plyer
             from plyer import notification
+            self._notify = notification.notify
             return True
         except ImportError:
             logging.info("📝 plyer not available - desktop notifications disabled")
             return False
     
-    def _create_icon_image(self, color="gray"):
-        """Create a microphone icon for the system tray."""
-        # Create a simple microphone icon
-        img = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        if color == "red":
-            fill_color = (255, 0, 0, 255)  # Red when recording
-        else:
-            fill_color = (128, 128, 128, 255)  # Gray when idle
-        
-        # Draw microphone shape
-        # Microphone body (rounded rectangle)
-        draw.rounded_rectangle([20, 15, 44, 40], radius=8, fill=fill_color)
-        
-        # Microphone stand
-        draw.rectangle([30, 40, 34, 55], fill=fill_color)
-        
-        # Base
-        draw.ellipse([25, 50, 39, 58], fill=fill_color)
-        
-        return img
-    
     def _setup_tray_icon(self):
         """Setup system tray icon."""
         if not self.has_pystray:
@@ -85,20 +72,25 @@ class SimpleVisualIndicator:
             # Create menu items
             menu_items = [
                 pystray.MenuItem("Voice-to-Text App", lambda: None, enabled=False),
-                pystray.MenuItem("Status: Idle", lambda: None, enabled=False),
+                # Text is read on each menu refresh, so state changes only
+                # need to update _status_text and call update_menu()
+                pystray.MenuItem(lambda item: self._status_text, lambda: None, enabled=False),
                 pystray.Menu.SEPARATOR,
                 pystray.MenuItem("Exit", self._quit_app)
             ]
             
             # Create tray icon
-            icon_image = self._create_icon_image("gray")
             self.tray_icon = pystray.Icon(
                 "voice_to_text",
-                icon_image,
+                self._icon_gray,
                 "Voice-to-Text App - Idle",
                 menu=pystray.Menu(*menu_items)
             )
             
+            # On Windows, pystray shows balloons via Shell_NotifyIconW on this
+            # icon's own window, which skips plyer's per-call overhead
+            self._tray_notify = sys.platform == "win32" and self.tray_icon.HAS_NOTIFICATION
+            
             # Start tray icon in a separate thread
             threading.Thread(target=self.tray_icon.run, daemon=True).start()
             logging.info("✅ System tray icon initialized")
@@ -106,38 +98,46 @@ class SimpleVisualIndicator:
         except Exception as e:
             logging.warning(f"⚠️ Failed to setup system tray: {e}")
     
-    def _monitor_recording_time(self):
-        """Monitor recording time and show warnings."""
-        while self.running:
-            try:
-                if self.recording and self.start_time:
-                    elapsed = time.time() - self.start_time
-                    remaining = max(0, self.max_duration_sec - elapsed)
-                    
-                    # Warning when 30 seconds left
-                    if remaining <= 30 and remaining > 29 and not self.warning_30_shown:
-                        self._show_notification("⚠️ Recording Time Warning", "30 seconds remaining!")
-                        self.warning_30_shown = True
-                    
-                    # Warning when 10 seconds left
-                    if remaining <= 10 and remaining > 9 and not self.warning_10_shown:
-                        self._show_notification("⚠️ Recording Time Warning", "10 seconds remaining!")
-                        self.warning_10_shown = True
-                
-                time.sleep(1)  # Check every second
-                
-            except Exception as e:
-                logging.warning(f"⚠️ Recording monitor error: {e}")
-                time.sleep(1)
+    def _schedule_warnings(self):
+        """Schedule one-shot timers for the 30 s and 10 s remaining warnings."""
+        self._cancel_warnings()
+        for seconds_left in (30, 10):
+            delay = self.max_duration_sec - seconds_left
+            if delay <= 0:
+                continue
+            timer = threading.Timer(
+                delay,
+                self._show_notification,
+                args=("⚠️ Recording Time Warning", f"{seconds_left} seconds remaining!")
+            )
+            timer.daemon = True
+            timer.start()
+            self._warning_timers.append(timer)
+    
+    def _cancel_warnings(self):
+        """Cancel any pending time warning timers."""
+        for timer in self._warning_timers:
+            timer.cancel()
+        self._warning_timers = []
     
     def _show_notification(self, title, message):
-        """Show desktop notification."""
-        if not self.has_plyer:
+        """Show desktop notification (coalesced, non-blocking)."""
+        self._notifications.submit(title, message)
+    
+    def _send_notification(self, title, message):
+        """Deliver a desktop notification (runs on the notification thread)."""
+        if self._tray_notify:
+            try:
+                self.tray_icon.notify(message, title)
+                return
+            except Exception as e:
+                logging.debug(f"Tray notification failed, falling back to plyer: {e}")
+        
+        if self._notify is None:
             return
         
         try:
-            from plyer import notification
-            notification.notify(
+            self._notify(
                 title=title,
                 message=message,
                 app_name="Voice-to-Text",
@@ -148,34 +148,34 @@ class SimpleVisualIndicator:
     
     def _quit_app(self):
         """Quit the application from tray menu."""
+        # Let the app shut down gracefully (e.g. close the session log)
+        if self.on_exit:
+            self.on_exit()
         import os
         os._exit(0)
     
+    def _apply_tray_state(self, recording):
+        """Apply tray icon, tooltip and menu status (the only mutator of tray state)."""
+        state = "Recording" if recording else "Idle"
+        try:
+            self.tray_icon.icon = self._icon_red if recording else self._icon_gray
+            self.tray_icon.title = f"Voice-to-Text App - {state}"
+            
+            # Update menu to show current status
+            self._status_text = f"Status: {state}"
+            self.tray_icon.update_menu()
+        except Exception as e:
+            logging.warning(f"⚠️ Tray icon update error: {e}")
+    
     def start_recording(self):
         """Visual feedback for recording start."""
         self.recording = True
         self.start_time = time.time()
-        self.warning_30_shown = False
-        self.warning_10_shown = False
+        self._schedule_warnings()
         
         # Update tray icon
         if self.has_pystray and self.tray_icon:
-            try:
-                icon_image = self._create_icon_image("red")
-                self.tray_icon.icon = icon_image
-                self.tray_icon.title = "Voice-to-Text App - Recording"
-                
-                # Update menu to show recording status
-                menu_items = [
-                    pystray.MenuItem("Voice-to-Text App", lambda: None, enabled=False),
-                    pystray.MenuItem("Status: Recording", lambda: None, enabled=False),
-                    pystray.Menu.SEPARATOR,
-                    pystray.MenuItem("Exit", self._quit_app)
-                ]
-                self.tray_icon.menu = pystray.Menu(*menu_items)
-                
-            except Exception as e:
-                logging.warning(f"⚠️ Tray icon update error: {e}")
+            self._tray_updates.submit(True)
         
         # Show notification
         self._show_notification("🎙️ Recording Started", "Voice recording in progress...")
@@ -185,25 +185,11 @@ class SimpleVisualIndicator:
     def stop_recording(self):
         """Visual feedback for recording stop."""
         self.recording = False
+        self._cancel_warnings()
         
         # Update tray icon
         if self.has_pystray and self.tray_icon:
-            try:
-                icon_image = self._create_icon_image("gray")
-                self.tray_icon.icon = icon_image
-                self.tray_icon.title = "Voice-to-Text App - Idle"
-                
-                # Update menu to show idle status
-                menu_items = [
-                    pystray.MenuItem("Voice-to-Text App", lambda: None, enabled=False),
-                    pystray.MenuItem("Status: Idle", lambda: None, enabled=False),
-                    pystray.Menu.SEPARATOR,
-                    pystray.MenuItem("Exit", self._quit_app)
-                ]
-                self.tray_icon.menu = pystray.Menu(*menu_items)
-                
-            except Exception as e:
-                logging.warning(f"⚠️ Tray icon update error: {e}")
+            self._tray_updates.submit(False)
         
         # Show notification
         self._show_notification("⏹️ Recording Stopped", "Processing audio...")
@@ -226,6 +212,7 @@ class SimpleVisualIndicator:
     def cleanup(self):
         """Clean up visual components."""
         self.running = False
+        self._cancel_warnings()
         
         if self.has_pystray and self.tray_icon:
             try:
@@ -4,62 +4,56 @@ Test script to verify that all dependencies are properly installed
 and the basic components of the voice-to-text app are working.
 """
 
+import argparse
+import importlib
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# (module to import, name shown in the report), in report order
+REQUIRED_MODULES = [
+    ("numpy", "numpy"),
+    ("scipy.io.wavfile", "scipy"),
+    ("sounddevice", "sounddevice"),
+    ("faster_whisper", "faster_whisper"),
+    ("keyboard", "keyboard"),
+    ("pyperclip", "pyperclip"),
+    ("pyautogui", "pyautogui"),
+]
+
+def _try_import(module_name):
+    """Import a module and return (ok, error)."""
+    try:
+        importlib.import_module(module_name)
+        return True, None
+    except ImportError as e:
+        return False, e
+    except Exception as e:
+        # Some native modules misbehave when first imported off the main
+        # thread; retry those serially from the main thread
+        return None, e
 
 def test_imports():
     """Test that all required modules can be imported."""
     print("Testing imports...")
     
-    try:
-        import numpy as np
-        print("✅ numpy imported successfully")
-    except ImportError as e:
-        print(f"❌ Failed to import numpy: {e}")
-        return False
-    
-    try:
-        import scipy.io.wavfile as wav
-        print("✅ scipy imported successfully")
-    except ImportError as e:
-        print(f"❌ Failed to import scipy: {e}")
-        return False
-    
-    try:
-        import sounddevice as sd
-        print("✅ sounddevice imported successfully")
-    except ImportError as e:
-        print(f"❌ Failed to import sounddevice: {e}")
-        return False
-    
-    try:
-        import whisper
-        print("✅ whisper imported successfully")
-    except ImportError as e:
-        print(f"❌ Failed to import whisper: {e}")
-        return False
-    
-    try:
-        import keyboard
-        print("✅ keyboard imported successfully")
-    except ImportError as e:
-        print(f"❌ Failed to import keyboard: {e}")
-        return False
-    
-    try:
-        import pyperclip
-        print("✅ pyperclip imported successfully")
-    except ImportError as e:
-        print(f"❌ Failed to import pyperclip: {e}")
-        return False
-    
-    try:
-        import pyautogui
-        print("✅ pyautogui imported successfully")
-    except ImportError as e:
-        print(f"❌ Failed to import pyautogui: {e}")
-        return False
+    # Import in parallel so the slow native library loads overlap
+    modules = [module for module, _ in REQUIRED_MODULES]
+    with ThreadPoolExecutor(max_workers=len(modules)) as executor:
+        results = list(executor.map(_try_import, modules))
+    
+    all_ok = True
+    for (module, label), (ok, error) in zip(REQUIRED_MODULES, results):
+        if ok is None:
+            ok, error = _try_import(module)
+            ok = bool(ok)
+        if ok:
+            print(f"✅ {label} imported successfully")
+        else:
+            print(f"❌ Failed to import {label}: {error}")
+            all_ok = False
     
-    return True
+    return all_ok
 
 def test_audio_devices():
     """Test audio device detection."""
@@ -84,14 +78,26 @@ def test_audio_devices():
         print(f"❌ Error checking audio devices: {e}")
         return False
 
-def test_whisper_model():
-    """Test Whisper model loading (this may take a moment)."""
+def test_whisper_model(full=False):
+    """Test Whisper model loading (only downloads and loads the model when full=True)."""
     print("\nTesting Whisper model loading...")
     
     try:
-        import whisper
+        from faster_whisper import WhisperModel
+        from faster_whisper.utils import download_model
+        
+        # Without --full, never download or load; just report the cache state
+        if not full:
+            try:
+                path = download_model("base", local_files_only=True)
+                print(f"✅ Whisper 'base' checkpoint cached at {path} (load skipped, use --full to load)")
+            except Exception:
+                print("📝 Whisper 'base' checkpoint not cached yet; the app will download it on first run")
+                print("   Use --full to download and load it now")
+            return True
+        
         print("🔄 Loading Whisper 'base' model... (this may take a moment)")
-        model = whisper.load_model("base")
+        model = WhisperModel("base", device="cpu", compute_type="int8")
         print("✅ Whisper model loaded successfully!")
         return True
     except Exception as e:
@@ -125,6 +131,15 @@ def test_clipboard():
 
 def main():
     """Run all tests."""
+    parser = argparse.ArgumentParser(description="Verify the Voice-to-Text App setup.")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="always load the Whisper model (also enabled by QUICKTALK_TEST_FULL=1)"
+    )
+    args = parser.parse_args()
+    full = args.full or os.environ.get("QUICKTALK_TEST_FULL") == "1"
+    
     print("=" * 60)
     print("🧪 Voice-to-Text App Setup Test")
     print("=" * 60)
@@ -133,7 +148,7 @@ def main():
         ("Import Test", test_imports),
         ("Audio Devices Test", test_audio_devices),
         ("Clipboard Test", test_clipboard),
-        ("Whisper Model Test", test_whisper_model),
+        ("Whisper Model Test", lambda: test_whisper_model(full)),
     ]
     
     results = []
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tray Icons Module for Voice-to-Text App
+Provides the pre-rendered microphone icons used by the system tray indicators.
+"""
+
+import base64
+import io
+import numpy as np
+from PIL import Image
+
+# Fill colors for each icon variant
+ICON_COLORS = {
+    "gray": (128, 128, 128),  # Gray when idle
+    "red": (255, 0, 0),       # Red when recording
+}
+
+# 64x64 microphone shape as an 8-bit alpha mask PNG, produced by
+# render_mask_png_b64() (run this module to regenerate)
+_MASK_PNG_B64 = "iVBORw0KGgoAAAANSUhEUgAAAEAAAABACAAAAACPAi4CAAAAgElEQVR42u2WwQ6AIAxD6f7/n+vVg+ATgjGmPZbxMjcctBZF0U+k/pJRnND2QWTR/RfOCGDo9QDmbq12oXgC1/6eDAIIIIDxnNN7nyDuFk9Wj4ooWph9F8sJohzlANYAHt61tyfRJKzYv+AJgNGT4dNdECt2sQapzQ0Uo6kTreoAxmoUUZqeHvcAAAAASUVORK5CYII="
+
+# Decoded once at import
+_MASK = np.asarray(Image.open(io.BytesIO(base64.b64decode(_MASK_PNG_B64))).convert("L"), dtype=np.uint8)
+
+def make_icon(rgb):
+    """Return the microphone icon filled with the given RGB color."""
+    rgba = np.empty(_MASK.shape + (4,), dtype=np.uint8)
+    rgba[..., :3] = rgb
+    rgba[..., 3] = _MASK
+    return Image.fromarray(rgba, "RGBA")
+
+# Built once at import so every indicator shares the same images
+TRAY_ICONS = {color: make_icon(rgb) for color, rgb in ICON_COLORS.items()}
+
+def render_mask_png_b64():
+    """Draw the microphone shape mask and return it as a base64 PNG (build-time only)."""
+    # ImageDraw is only needed to regenerate the embedded mask
+    from PIL import ImageDraw
+
+    img = Image.new('L', (64, 64), 0)
+    draw = ImageDraw.Draw(img)
+
+    # Microphone body (rounded rectangle)
+    draw.rounded_rectangle([20, 15, 44, 40], radius=8, fill=255)
+
+    # Microphone stand
+    draw.rectangle([30, 40, 34, 55], fill=255)
+
+    # Base
+    draw.ellipse([25, 50, 39, 58], fill=255)
+
+    buffer = io.BytesIO()
+    img.save(buffer, "PNG", optimize=True)
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+if __name__ == "__main__":
+    print(f'_MASK_PNG_B64 = "{render_mask_png_b64()}"')
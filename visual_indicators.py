@@ -6,25 +6,42 @@ Provides system tray icon, overlay window, and desktop notifications.
 
 import tkinter as tk
 from tkinter import ttk
+import sys
 import threading
 import time
 import logging
-from PIL import Image, ImageDraw
+from tray_icons import TRAY_ICONS
+from coalescer import Coalescer
 import io
 
 class VisualIndicator:
     """Manages all visual feedback for the voice-to-text application."""
     
-    def __init__(self, max_duration_sec=300):
+    def __init__(self, max_duration_sec=300, on_exit=None):
         self.max_duration_sec = max_duration_sec
+        self.on_exit = on_exit  # app shutdown hook used by the tray "Exit" item
         self.recording = False
         self.start_time = None
         self.overlay_window = None
         self.tray_icon = None
+        self._status_text = "Status: Idle"
         self.update_thread = None
+        self._update_after_id = None
+        self._warning_after_ids = []
         self.running = True
         
+        # Pre-rendered tray icon variants; state changes just swap them
+        self._icon_gray = TRAY_ICONS["gray"]
+        self._icon_red = TRAY_ICONS["red"]
+        
+        # Notifications and tray updates run off the caller's thread; under
+        # bursty triggers only the latest pending one is applied
+        self._notifications = Coalescer(self._send_notification)
+        self._tray_updates = Coalescer(self._apply_tray_state)
+        
         # Try to import optional dependencies
+        self._notify = None
+        self._tray_notify = False
         self.has_pystray = self._try_import_pystray()
         self.has_plyer = self._try_import_plyer()
         
@@ -46,36 +63,13 @@ class VisualIndicator:
     def _try_import_plyer(self):
         """Try to import plyer for desktop notifications."""
         try:
-            global plyer
             from plyer import notification
+            self._notify = notification.notify
             return True
         except ImportError:
             logging.info("📝 plyer not available - desktop notifications disabled")
             return False
     
-    def _create_icon_image(self, color="gray"):
-        """Create a microphone icon for the system tray."""
-        # Create a simple microphone icon
-        img = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        if color == "red":
-            fill_color = (255, 0, 0, 255)  # Red when recording
-        else:
-            fill_color = (128, 128, 128, 255)  # Gray when idle
-        
-        # Draw microphone shape
-        # Microphone body (rounded rectangle)
-        draw.rounded_rectangle([20, 15, 44, 40], radius=8, fill=fill_color)
-        
-        # Microphone stand
-        draw.rectangle([30, 40, 34, 55], fill=fill_color)
-        
-        # Base
-        draw.ellipse([25, 50, 39, 58], fill=fill_color)
-        
-        return img
-    
     def _setup_tray_icon(self):
         """Setup system tray icon."""
         if not self.has_pystray:
@@ -85,20 +79,25 @@ class VisualIndicator:
             # Create menu items
             menu_items = [
                 pystray.MenuItem("Voice-to-Text App", lambda: None, enabled=False),
-                pystray.MenuItem("Status: Idle", lambda: None, enabled=False),
+                # Text is read on each menu refresh, so state changes only
+                # need to update _status_text and call update_menu()
+                pystray.MenuItem(lambda item: self._status_text, lambda: None, enabled=False),
                 pystray.Menu.SEPARATOR,
                 pystray.MenuItem("Exit", self._quit_app)
             ]
             
             # Create tray icon
-            icon_image = self._create_icon_image("gray")
             self.tray_icon = pystray.Icon(
                 "voice_to_text",
-                icon_image,
+                self._icon_gray,
                 "Voice-to-Text App - Idle",
                 menu=pystray.Menu(*menu_items)
             )
             
+            # On Windows, pystray shows balloons via Shell_NotifyIconW on this
+            # icon's own window, which skips plyer's per-call overhead
+            self._tray_notify = sys.platform == "win32" and self.tray_icon.HAS_NOTIFICATION
+            
             # Start tray icon in a separate thread
             threading.Thread(target=self.tray_icon.run, daemon=True).start()
             logging.info("✅ System tray icon initialized")
@@ -178,9 +177,6 @@ class VisualIndicator:
             # Signal that setup is complete
             self.overlay_setup_complete.set()
 
-            # Start update loop in this thread
-            self._start_overlay_update_loop()
-
             # Run the tkinter event loop in this thread
             self.overlay_window.mainloop()
 
@@ -190,42 +186,58 @@ class VisualIndicator:
             self.overlay_setup_complete.set()  # Signal completion even on error
     
     def _start_overlay_update_loop(self):
-        """Start the overlay update loop in the same thread as the overlay window."""
-        def update_loop():
-            if self.overlay_window and self.recording:
-                try:
-                    elapsed = time.time() - self.start_time
-                    remaining = max(0, self.max_duration_sec - elapsed)
-
-                    # Update timer display
-                    minutes = int(remaining // 60)
-                    seconds = int(remaining % 60)
-                    timer_text = f"⏱️ {minutes:02d}:{seconds:02d} remaining"
-
-                    # Update progress bar
-                    progress = (elapsed / self.max_duration_sec) * 100
-
-                    # Update display directly (we're in the right thread now)
-                    self._update_overlay_display(timer_text, progress)
+        """(Re)start the overlay update loop (called on the overlay thread)."""
+        if self._update_after_id is not None:
+            self.overlay_window.after_cancel(self._update_after_id)
+            self._update_after_id = None
+        self._overlay_update_loop()
+    
+    def _overlay_update_loop(self):
+        """Update the overlay once per second while recording."""
+        self._update_after_id = None
+        if self.overlay_window and self.recording:
+            try:
+                elapsed = time.time() - self.start_time
+                remaining = max(0, self.max_duration_sec - elapsed)
 
-                    # Warning when 30 seconds left
-                    if remaining <= 30 and remaining > 29:
-                        self._show_notification("⚠️ Recording Time Warning", "30 seconds remaining!")
+                # Update timer display
+                minutes = int(remaining // 60)
+                seconds = int(remaining % 60)
+                timer_text = f"⏱️ {minutes:02d}:{seconds:02d} remaining"
 
-                    # Warning when 10 seconds left
-                    if remaining <= 10 and remaining > 9:
-                        self._show_notification("⚠️ Recording Time Warning", "10 seconds remaining!")
+                # Update progress bar
+                progress = (elapsed / self.max_duration_sec) * 100
 
-                except Exception as e:
-                    logging.warning(f"⚠️ Overlay update error: {e}")
+                # Update display directly (we're in the right thread now)
+                self._update_overlay_display(timer_text, progress)
 
-            # Schedule next update
-            if self.running and self.overlay_window:
-                self.overlay_window.after(1000, update_loop)  # Update every second
+            except Exception as e:
+                logging.warning(f"⚠️ Overlay update error: {e}")
 
-        # Start the update loop
-        if self.overlay_window:
-            self.overlay_window.after(100, update_loop)  # Start after 100ms
+        # Schedule next update only while recording; start_recording restarts the loop
+        if self.running and self.overlay_window and self.recording:
+            self._update_after_id = self.overlay_window.after(1000, self._overlay_update_loop)
+    
+    def _schedule_warnings(self):
+        """Schedule one-shot 30 s and 10 s remaining warnings (called on the overlay thread)."""
+        self._cancel_warnings()
+        for seconds_left in (30, 10):
+            delay_ms = int((self.max_duration_sec - seconds_left) * 1000)
+            if delay_ms <= 0:
+                continue
+            after_id = self.overlay_window.after(
+                delay_ms,
+                self._show_notification,
+                "⚠️ Recording Time Warning",
+                f"{seconds_left} seconds remaining!"
+            )
+            self._warning_after_ids.append(after_id)
+    
+    def _cancel_warnings(self):
+        """Cancel pending time warnings (called on the overlay thread)."""
+        for after_id in self._warning_after_ids:
+            self.overlay_window.after_cancel(after_id)
+        self._warning_after_ids = []
     
     def _update_overlay_display(self, timer_text, progress):
         """Update overlay display elements (called on main thread)."""
@@ -238,13 +250,23 @@ class VisualIndicator:
             logging.warning(f"⚠️ Display update error: {e}")
     
     def _show_notification(self, title, message):
-        """Show desktop notification."""
-        if not self.has_plyer:
+        """Show desktop notification (coalesced, non-blocking)."""
+        self._notifications.submit(title, message)
+    
+    def _send_notification(self, title, message):
+        """Deliver a desktop notification (runs on the notification thread)."""
+        if self._tray_notify:
+            try:
+                self.tray_icon.notify(message, title)
+                return
+            except Exception as e:
+                logging.debug(f"Tray notification failed, falling back to plyer: {e}")
+        
+        if self._notify is None:
             return
         
         try:
-            from plyer import notification
-            notification.notify(
+            self._notify(
                 title=title,
                 message=message,
                 app_name="Voice-to-Text",
@@ -255,9 +277,25 @@ class VisualIndicator:
     
     def _quit_app(self):
         """Quit the application from tray menu."""
+        # Let the app shut down gracefully (e.g. close the session log)
+        if self.on_exit:
+            self.on_exit()
         import os
         os._exit(0)
     
+    def _apply_tray_state(self, recording):
+        """Apply tray icon, tooltip and menu status (the only mutator of tray state)."""
+        state = "Recording" if recording else "Idle"
+        try:
+            self.tray_icon.icon = self._icon_red if recording else self._icon_gray
+            self.tray_icon.title = f"Voice-to-Text App - {state}"
+            
+            # Update menu to show current status
+            self._status_text = f"Status: {state}"
+            self.tray_icon.update_menu()
+        except Exception as e:
+            logging.warning(f"⚠️ Tray icon update error: {e}")
+    
     def start_recording(self):
         """Visual feedback for recording start."""
         self.recording = True
@@ -268,17 +306,14 @@ class VisualIndicator:
             try:
                 self.overlay_window.after(0, lambda: self._update_recording_ui(True))
                 self.overlay_window.after(0, self.overlay_window.deiconify)  # Show window
+                self.overlay_window.after(0, self._start_overlay_update_loop)
+                self.overlay_window.after(0, self._schedule_warnings)
             except Exception as e:
                 logging.warning(f"⚠️ Overlay start recording error: {e}")
 
         # Update tray icon
         if self.has_pystray and self.tray_icon:
-            try:
-                icon_image = self._create_icon_image("red")
-                self.tray_icon.icon = icon_image
-                self.tray_icon.title = "Voice-to-Text App - Recording"
-            except Exception as e:
-                logging.warning(f"⚠️ Tray icon update error: {e}")
+            self._tray_updates.submit(True)
 
         # Show notification
         self._show_notification("🎙️ Recording Started", "Voice recording in progress...")
@@ -294,17 +329,13 @@ class VisualIndicator:
             try:
                 self.overlay_window.after(0, lambda: self._update_recording_ui(False))
                 self.overlay_window.after(0, self.overlay_window.withdraw)  # Hide window
+                self.overlay_window.after(0, self._cancel_warnings)
             except Exception as e:
                 logging.warning(f"⚠️ Overlay stop recording error: {e}")
 
         # Update tray icon
         if self.has_pystray and self.tray_icon:
-            try:
-                icon_image = self._create_icon_image("gray")
-                self.tray_icon.icon = icon_image
-                self.tray_icon.title = "Voice-to-Text App - Idle"
-            except Exception as e:
-                logging.warning(f"⚠️ Tray icon update error: {e}")
+            self._tray_updates.submit(False)
 
         # Show notification
         self._show_notification("⏹️ Recording Stopped", "Processing audio...")